@@ -27,6 +27,8 @@
 
 #define LOG_HEADER "TS,T,V"
 #define LOG_END "E"
+#define LOG_FRAME 'G'  // Starts a binary log dump: LOG_FRAME, uint32 record count, the Event records, LOG_END
+#define BINARY_LOGS 1  // 0 prints the logs as "TS,T,V" text lines instead (readable from the Serial Monitor)
 #define ERROR "R"
 #define SUCCESS "OK"
 #define CMD_UNKNOWN "U"
@@ -162,15 +164,33 @@ void logEvent(const uint8_t type, const uint16_t value) {
 
 /**
  * @brief Print all logged events from EEPROM to serial.
+ *
+ * With BINARY_LOGS the events are sent as a single frame: LOG_FRAME, the uint32 number of records
+ * and the raw little-endian Event records (7 bytes each), followed by the LOG_END line.
  */
 void printLogs() {
     const unsigned int logDataAreaLength = EEPROM.length() - LOG_START_ADDRESS;
     const unsigned int usableLogLength = logDataAreaLength / RECORD_SIZE * RECORD_SIZE;
 
     if (xSemaphoreTake(serialMutex, portMAX_DELAY) == pdTRUE) {
+        Event e{};
+#if BINARY_LOGS
+        uint32_t count = 0;
+        // We use timestamp==0xFFFFFFFF to mark “empty” slots
+        for (unsigned int offset = 0; offset < usableLogLength; offset += RECORD_SIZE) {
+            EEPROM.get(static_cast<int>(LOG_START_ADDRESS + offset), e);
+            if (e.timestamp == 0xFFFFFFFFUL) break;
+            count++;
+        }
+        Serial.write(LOG_FRAME);
+        Serial.write(reinterpret_cast<const uint8_t *>(&count), sizeof(count));
+        for (uint32_t i = 0; i < count; i++) {
+            EEPROM.get(static_cast<int>(LOG_START_ADDRESS + i * RECORD_SIZE), e);
+            Serial.write(reinterpret_cast<const uint8_t *>(&e), RECORD_SIZE);
+        }
+#else
         Serial.println(F(LOG_HEADER));
         if (usableLogLength > 0) {
-            Event e{};
             for (unsigned int offset = 0; offset < usableLogLength; offset += RECORD_SIZE) {
                 const unsigned int addr = LOG_START_ADDRESS + offset;
                 EEPROM.get(static_cast<int>(addr), e);
@@ -182,6 +202,7 @@ void printLogs() {
                 Serial.println(e.value);
             }
         }
+#endif
         Serial.println(F(LOG_END));
         xSemaphoreGive(serialMutex);
     }
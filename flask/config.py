@@ -3,14 +3,28 @@ import logging
 # Configuration file for Flask application
 
 # Serial communication configuration
-SERIAL_TIMEOUT = 5
+SERIAL_TIMEOUT = 0.5  # Seconds a serial read blocks waiting for data
 BAUD_RATE = 115200
 SERIAL_PORT = 'COM4'
+SERIAL_RX_BUFFER_SIZE = 65536  # Bytes of driver receive buffer requested on Windows
+# Bytes of queued commands joined into one write. A batch ends at most 11 B past it (a 12 B command started below it)
+# and serial_writer sends it only after the previous batch was read, so it always fits the AVR's 64 B RX buffer
+SERIAL_TX_BATCH_SIZE = 48
+SERIAL_DRAIN_INTERVAL = 1.6  # Seconds to wait for replies to a batch, the firmware reads its RX buffer every 1.5 s
 
 # NTP Server configuration
 NTP_SERVER = 'pool.ntp.org'
 TIME_ZONE_OFFSET = 0
+NTP_TIMEOUT = 2  # Seconds to wait for the NTP server's response
+NTP_REFRESH_INTERVAL = 24 * 3600  # Seconds before the cached NTP time is requested again
+NTP_MAX_DELAY = 1  # Seconds of round trip delay above which an NTP response is discarded
 
-# Logging configuration
-logger = logging.getLogger(__name__)
-logging.basicConfig(format="%(asctime)s || %(levelname)s || %(message)s", datefmt="%Y-%m-%d %H:%M:%S", level=logging.INFO)
+# SocketIO configuration
+SOCKETIO_MESSAGE_QUEUE = None  # e.g. 'redis://localhost:6379' to share events between server processes
+SENSOR_EMIT_INTERVAL = 0.05  # Seconds between sensor_update broadcasts (20 Hz)
+SENSOR_DEADBAND = 2  # Minimum change in a sensor value (ADC counts) that gets broadcast
+THRESHOLD_FLUSH_INTERVAL = 0.1  # Seconds over which threshold updates from the clients are coalesced
+LOG_CHUNK_SIZE = 500  # Log entries per log_data_chunk message
+
+# Logging configuration, applied by log_config
+LOG_LEVEL = logging.INFO  # logging.WARNING in production drops the per-event info records
@@ -0,0 +1,66 @@
+"""
+Console logging for the Flask application.
+Records are queued by the caller and written to the console by a real OS thread, so a slow console
+never blocks the eventlet hub the serial and SocketIO tasks run on. web_server monkey patches threading
+and queue before this module is imported, so that thread, its queue and its lock come from the unpatched modules.
+"""
+import atexit
+import logging
+from logging.handlers import QueueHandler
+
+from eventlet.patcher import original
+
+from config import LOG_LEVEL
+
+os_threading = original("threading")
+log_queue = original("queue").SimpleQueue()  # Records waiting to be written by console_writer
+logger = logging.getLogger(__name__)
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """
+    StreamHandler for the console writer's OS thread. A green lock can't be taken outside the hub's thread,
+    so it's locked with an unpatched RLock.
+    """
+
+    def createLock(self):
+        """
+        Creates the lock taken around each write.
+        """
+        self.lock = os_threading.RLock()
+
+
+def start_os_thread(target) -> os_threading.Thread:
+    """
+    Starts a daemon thread that is a real OS thread, even after eventlet's monkey patching.
+    :param target: Function run by the thread.
+    :return: The started thread.
+    """
+    thread = os_threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def write_queued_records():
+    """
+    Writes the queued records to the console, until stop_console_writer queues None.
+    """
+    while (record := log_queue.get()) is not None:
+        console_handler.handle(record)
+
+
+def stop_console_writer():
+    """
+    Writes out the records still queued, then stops console_writer.
+    """
+    log_queue.put(None)
+    console_writer.join()
+
+
+console_handler = ConsoleHandler()
+console_handler.setFormatter(logging.Formatter("%(asctime)s || %(levelname)s || %(message)s", "%Y-%m-%d %H:%M:%S"))
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))  # Only merges the arguments, console_handler adds the rest
+logging.basicConfig(handlers=[queue_handler], level=LOG_LEVEL)
+console_writer = start_os_thread(write_queued_records)
+atexit.register(stop_console_writer)
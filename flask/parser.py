@@ -0,0 +1,107 @@
+"""
+Parsing of the lines and log frames received from the Arduino.
+Pure functions without I/O or SocketIO calls, fully typed so the module can be compiled with mypyc
+(pip install mypy, then run "mypyc parser.py" in this folder). web_server imports the compiled
+extension when it's present next to this file, otherwise this source is used as is.
+"""
+import struct
+from array import array
+from typing import Final
+
+MEASUREMENT_LIGHT_B: Final = b"l"  # Separates the moisture and light values in m{moisture}l{light}
+LOG_FRAME_B: Final = b"G"  # Starts a binary log dump: LOG_FRAME_B, uint32 record count, the records, then LOG_END
+LOG_FRAME_HEADER: Final = struct.Struct("<I")  # Record count after LOG_FRAME_B
+LOG_RECORD: Final = struct.Struct("<IBH")  # Arduino's Event struct: timestamp, event type, value
+LOG_FRAME_MAX_RECORDS: Final = 4096 // LOG_RECORD.size  # Records that fit in the largest AVR EEPROM
+LOG_FRAME_START: Final = 1 + LOG_FRAME_HEADER.size  # Offset of the first record in a frame
+LOG_FIELD_MAX: Final = 0xFFFFFFFF  # Largest value a log column holds
+
+
+def parse_sensor_line(line: bytes) -> tuple[int, int] | None:
+    """
+    Parses sensor data m{moisture}l{light}.
+    :param line: Serial input line, starting with the moisture marker.
+    :return: (moisture, light), or None if the line is malformed.
+    """
+    moisture, separator, light = line[1:].partition(MEASUREMENT_LIGHT_B)
+    if not separator or not moisture.isdigit() or not light.isdigit():
+        return None
+    return int(moisture), int(light)
+
+
+def parse_threshold_line(line: bytes) -> int | None:
+    """
+    Parses a threshold response X{threshold} or Z{threshold}.
+    :param line: Serial input line, starting with the command character.
+    :return: Threshold value, or None if the line is malformed.
+    """
+    value = line[1:]
+    if not value.isdigit():
+        return None
+    return int(value)
+
+
+def parse_log_line(line: bytes) -> tuple[int, int, int] | None:
+    """
+    Parses a text log entry {timestamp},{type},{value}.
+    :param line: Serial input line.
+    :return: (timestamp, type, value), or None if the line is malformed or a field doesn't fit in a log column.
+    """
+    parts = line.split(b",", 2)
+    if len(parts) != 3:
+        return None
+    timestamp, event_type, value = parts
+    if not timestamp.isdigit() or not event_type.isdigit() or not value.isdigit():
+        return None
+    entry = int(timestamp), int(event_type), int(value)
+    if max(entry) > LOG_FIELD_MAX:
+        return None
+    return entry
+
+
+def new_log_columns() -> tuple[array, array, array]:
+    """
+    Creates empty log columns. Entries are stored column by column in unsigned 32-bit arrays,
+    far smaller than a list per entry.
+    :return: (timestamps, event types, values)
+    """
+    return array("I"), array("I"), array("I")
+
+
+def parse_log_frame(frame: bytes) -> tuple[array, array, array] | None:
+    """
+    Unpacks the records of a binary log frame.
+    :param frame: Complete log frame, header included.
+    :return: (timestamps, event types, values) columns, or None if the frame's size doesn't match its record count.
+    """
+    if len(frame) < LOG_FRAME_START or frame[:1] != LOG_FRAME_B:
+        return None
+    count: int = LOG_FRAME_HEADER.unpack_from(frame, 1)[0]
+    if count > LOG_FRAME_MAX_RECORDS or len(frame) - LOG_FRAME_START != count * LOG_RECORD.size:
+        return None
+    timestamps, event_types, values = new_log_columns()
+    records = memoryview(frame)[LOG_FRAME_START:]
+    for timestamp, event_type, value in LOG_RECORD.iter_unpack(records):
+        timestamps.append(timestamp)
+        event_types.append(event_type)
+        values.append(value)
+    return timestamps, event_types, values
+
+
+def log_frame_size(buffer: bytearray, start: int = 0) -> int | None:
+    """
+    Checks whether a binary log frame starts at the given offset of a receive buffer.
+    Records may contain newline bytes, so a frame has to be cut by its size and not by line.
+    :param buffer: Received bytes not yet split into lines.
+    :param start: Offset of the next message in buffer.
+    :return: Total frame size in bytes, or the header size while the header is incomplete.
+             None if the buffer doesn't start with a frame.
+    """
+    if buffer[start:start + 1] != LOG_FRAME_B:
+        return None
+    if len(buffer) - start < LOG_FRAME_START:
+        return LOG_FRAME_START
+    count: int = LOG_FRAME_HEADER.unpack_from(buffer, start + 1)[0]
+    if count > LOG_FRAME_MAX_RECORDS:
+        return None  # Not a real frame, handle it as a regular line
+    return LOG_FRAME_START + count * LOG_RECORD.size
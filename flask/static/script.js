@@ -15,6 +15,7 @@ const eventTypeMap = {
 };
 
 let moistureChart, lightChart;
+let receivedLogCount = 0; // Log entries received so far in the current transfer
 let sensorData = {
 	moisture: [],
 	light: [],
@@ -168,6 +169,7 @@ if (getLogsButton) { // Check if button exists
 		socket.emit('logs_request');
 		// Clear the table while waiting for new logs
 		if (logTableBody) logTableBody.innerHTML = ''; // Clear old logs
+		receivedLogCount = 0;
 	});
 }
 
@@ -191,44 +193,49 @@ if (clearLogsButton) { // Check if button exists
 socket.on('sensor_update', updateDisplay);
 
 /**
- * Receives log data from the backend and populates the log table.
+ * Receives log data chunks from the backend and appends them to the log table.
+ * The last chunk of a transfer is flagged with done.
  */
-socket.on('log_data', (data) => { // Listen for logs from backend
-	console.log("Received logs:", data.logs); // Log received data
+socket.on('log_data_chunk', (data) => { // Listen for logs from backend
+	console.log("Received logs:", data); // Log received data
 
-	if (!logTableBody || !data.logs) {
+	if (!logTableBody || !data.ts || !data.type || !data.value) {
 		updateLogStatus('Error displaying logs. Data unavailable.', 'error');
 		return;
 	}
 
-	logTableBody.innerHTML = ''; // Clear previous logs (could append too)
-	if (data.logs.length === 0) {
-		updateLogStatus('No logs found or received.', 'info');
-		return;
-	}
-
-	data.logs.forEach(log => { // Iterate through each log entry
+	data.ts.forEach((timestamp, i) => { // Entries come as parallel ts, type and value columns
+		const type = data.type[i];
 		const row = logTableBody.insertRow(); // Create new table row
-		row.insertCell().textContent = new Date(log.timestamp * 1000).toLocaleString();
-		row.insertCell().textContent = log.type;
-		row.insertCell().textContent = log.value;
-		row.insertCell().textContent = eventTypeMap[log.type] || "Unknown Event";
+		row.insertCell().textContent = new Date(timestamp * 1000).toLocaleString();
+		row.insertCell().textContent = type;
+		row.insertCell().textContent = data.value[i];
+		row.insertCell().textContent = eventTypeMap[type] || "Unknown Event";
 	});
+	receivedLogCount += data.ts.length;
 
-	updateLogStatus(`Received ${data.logs.length} log entries.`, 'info');
+	if (!data.done) {
+		updateLogStatus(`Receiving logs... ${receivedLogCount} entries so far.`, 'info');
+		return;
+	}
+	if (receivedLogCount === 0) {
+		updateLogStatus('No logs found or received.', 'info');
+	} else {
+		updateLogStatus(`Received ${receivedLogCount} log entries.`, 'info');
+	}
+	receivedLogCount = 0;
 });
 
 /**
- * Receives threshold updates from the backend and updates the UI sliders and displays.
+ * Updates the slider and value display of a threshold.
+ * @param {string} key - The threshold key (MT or LT).
+ * @param {number} value - The threshold value.
  */
-socket.on('threshold_update', (data) => {
-	console.log("Received threshold update:", data);
-	const {key, value} = data;
+function applyThreshold(key, value) {
+	// Find the slider and value display elements
 	const slider = $(`.threshold-input[data-type='${key}']`);
 	const valueDisplay = $(`#${key}Value`);
 
-	// Find the slider and value display elements
-
 	if (slider.length && valueDisplay.length) {
 		// Check if the current slider value is already what we received.
 		if (parseInt(slider.val()) !== parseInt(value)) {
@@ -236,6 +243,22 @@ socket.on('threshold_update', (data) => {
 		}
 		valueDisplay.text(value);
 	}
+}
+
+/**
+ * Receives threshold updates from the backend and updates the UI sliders and displays.
+ */
+socket.on('threshold_update', (data) => {
+	console.log("Received threshold update:", data);
+	applyThreshold(data.key, data.value);
+});
+
+/**
+ * Receives all current thresholds, keyed by threshold key, when connecting to the backend.
+ */
+socket.on('thresholds_init', (data) => {
+	console.log("Received initial thresholds:", data);
+	Object.entries(data).forEach(([key, value]) => applyThreshold(key, value));
 });
 
 /**
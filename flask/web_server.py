@@ -1,29 +1,110 @@
-import re
+import eventlet
+
+eventlet.monkey_patch()  # Must run before any other import so sockets, locks and sleeps yield to the hub
+
+import socket
 import sys
 import time
-from datetime import datetime, timedelta
-from threading import Thread, Lock
+from dataclasses import dataclass
+from queue import Empty, SimpleQueue
+from threading import Event, Lock
 
 import ntplib
+import orjson
 import serial
+from eventlet import tpool
+from eventlet.hubs import trampoline
 from flask import Flask, render_template, request
 from flask_socketio import SocketIO
 
-from config import SERIAL_TIMEOUT, BAUD_RATE, SERIAL_PORT, NTP_SERVER, TIME_ZONE_OFFSET, logger
+from config import SERIAL_TIMEOUT, BAUD_RATE, SERIAL_PORT, SERIAL_RX_BUFFER_SIZE, SERIAL_TX_BATCH_SIZE, \
+    SERIAL_DRAIN_INTERVAL, NTP_SERVER, NTP_TIMEOUT, NTP_REFRESH_INTERVAL, NTP_MAX_DELAY, TIME_ZONE_OFFSET, \
+    SENSOR_EMIT_INTERVAL, SENSOR_DEADBAND, THRESHOLD_FLUSH_INTERVAL, LOG_CHUNK_SIZE, SOCKETIO_MESSAGE_QUEUE
+from log_config import logger
+from parser import log_frame_size, new_log_columns, parse_log_frame, parse_log_line, \
+    parse_sensor_line, parse_threshold_line
+
+
+class OrjsonModule:
+    """
+    json module interface over orjson, used by SocketIO to encode and decode packets.
+    orjson returns bytes and takes no formatting options, SocketIO expects a str.
+    """
+
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        """
+        Serializes obj to a JSON string. Formatting kwargs are ignored, orjson output is always compact.
+        """
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def loads(data):
+        """
+        Deserializes a JSON string or bytes.
+        """
+        return orjson.loads(data)
+
+
+class LogFrame(bytes):
+    """
+    Binary log frame cut from the receive buffer by its size.
+    Its type tells it apart from text lines, which may start with the same character.
+    """
+    __slots__ = ()
+
+
+@dataclass(slots=True)
+class State:
+    """
+    Threshold values last confirmed by the Arduino or set by a client.
+    Each field is written with a single assignment, so readers never see a partial update.
+    Slotted, so fields are fixed and have no per-instance __dict__.
+    """
+    moisture_thresh: int = 500
+    light_thresh: int = 500
+
 
 app = Flask(__name__)
-socketio = SocketIO(app)
+# Each event handler runs in its own greenlet. With a message queue, emits are shared between server processes.
+socketio = SocketIO(app, async_mode="eventlet", async_handlers=True, message_queue=SOCKETIO_MESSAGE_QUEUE,
+                    json=OrjsonModule)
 
 try:
-    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=SERIAL_TIMEOUT)
+    # No flow control. Software flow control would also swallow the 0x11/0x13 bytes of binary log records
+    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=SERIAL_TIMEOUT, xonxoff=False, rtscts=False, dsrdtr=False)
+    if hasattr(ser, "set_buffer_size"):
+        # Windows only, the default driver buffer is 4 KB. A whole log dump fits in SERIAL_RX_BUFFER_SIZE,
+        # so it can be drained in one read
+        ser.set_buffer_size(rx_size=SERIAL_RX_BUFFER_SIZE)
+    try:
+        # USB-serial adapters buffer incoming bytes for up to 16 ms (FTDI latency timer) before
+        # handing them to the OS. Low latency mode drops that to ~1 ms, but it's only supported on Linux.
+        # Elsewhere, lower "Latency Timer" in the driver settings (Device Manager > Port Settings > Advanced),
+        # or write 1 to /sys/bus/usb-serial/devices/ttyUSB0/latency_timer if the ioctl is refused.
+        ser.set_low_latency_mode(True)
+    except (AttributeError, ValueError, OSError) as latency_error:
+        logger.info("Serial low latency mode not available: %s", latency_error)
 except serial.SerialException as port_error:
-    logger.error(f"Error opening serial port: {port_error}")
+    logger.error("Error opening serial port: %s", port_error)
     ser = None  # Set ser to None if port cannot be opened
 
-lock = Lock()
-
-MOISTURE_THRESH = 500
-LIGHT_THRESH = 500
+tx_queue = SimpleQueue()  # Encoded commands waiting to be written by serial_writer, the port's only writer
+tx_answered = Event()  # Set once the Arduino has replied to every command of the last batch
+tx_unanswered = 0  # Commands of the last batch the Arduino hasn't replied to yet
+_rx_buf = bytearray()  # Received bytes not yet split into lines
+_rx_scanned = 0  # Bytes at the start of _rx_buf already searched for a newline
+sensor_lock = Lock()
+latest_sensor = {"moisture": None, "light": None, "dirty": False}  # Last significant reading, None until the first one
+log_entries_sent = 0  # Log entries of the current dump already sent by emit_log_chunk
+pending_thresholds = {}  # Latest requested value per threshold key, not yet sent by threshold_flusher
+ntp_client = ntplib.NTPClient()
+ntp_address = None  # Resolved NTP_SERVER address, None until resolved or after a failed request
+ntp_offset = None  # NTP time minus time.monotonic(), None until the first successful request
+ntp_synced_at = 0.0  # time.monotonic() of the last successful NTP request
+TIME_ZONE_OFFSET_SECONDS = TIME_ZONE_OFFSET * 3600
+
+state = State()
 
 SUCCESS = "OK"
 ERROR = "R"
@@ -38,26 +119,55 @@ CMD_UNK = "U"
 LOG_END = "E"
 LOG_HEADER = "TS,T,V"
 MEASUREMENT_MOISTURE = 'm'
-MEASUREMENT_LIGHT = 'l'
 KET_LIGHT_THRESH = 'LT'
 KEY_MOISTURE_THRESH = 'MT'
 
+# Encoded commands, built once instead of on every send
+CMD_TIME_B = CMD_TIME.encode()
+CMD_GET_LIGHT_THRESH_B = f"{CMD_GET_LIGHT_THRESH}\n".encode()
+CMD_GET_MOISTURE_THRESH_B = f"{CMD_GET_MOISTURE_THRESH}\n".encode()
+CMD_CLEAR_LOGS_B = f"{CMD_CLEAR_LOGS}\n".encode()
+CMD_GET_LOGS_B = f"{CMD_GET_LOGS}\n".encode()
+
+# Encoded forms of the lines received from the Arduino, serial input is parsed as bytes
+SUCCESS_B = SUCCESS.encode()
+ERROR_B = ERROR.encode()
+CMD_UNK_B = CMD_UNK.encode()
+LOG_END_B = LOG_END.encode()
+LOG_HEADER_B = LOG_HEADER.encode()
+MEASUREMENT_MOISTURE_B = MEASUREMENT_MOISTURE.encode()
+
 
 def get_ntp_time() -> float | int:
     """
     Retrieves the current time from the configured NTP server.
-    Falls back to system time if NTP is unavailable.
+    The NTP time is cached as an offset from the monotonic clock and only requested again
+    after NTP_REFRESH_INTERVAL seconds, so most calls need no network round trip.
+    The server's address is resolved once and reused until a request fails.
+    Falls back to the cached offset, or to system time, if NTP is unavailable.
     :return: Current timestamp adjusted for TIME_ZONE_OFFSET.
     """
-    client = ntplib.NTPClient()
-    try:
-        response = client.request(NTP_SERVER, version=4)
-        # Adjusting with local offset AFTER getting UTC timestamp
-        return response.tx_time + TIME_ZONE_OFFSET * 3600
-    except Exception as e:
-        logger.warning(f"NTP Error, syncing with system time: {e}")
-        # Fallback to system time, ensuring it's timezone-aware if possible,
-        return (datetime.now() + timedelta(hours=TIME_ZONE_OFFSET)).timestamp()
+    global ntp_offset, ntp_synced_at, ntp_address
+    if ntp_offset is None or time.monotonic() - ntp_synced_at > NTP_REFRESH_INTERVAL:
+        try:
+            if ntp_address is None:
+                # Same lookup as ntplib's own, IPv4 or IPv6, but done once. A numeric address needs no DNS query
+                ntp_address = socket.getaddrinfo(NTP_SERVER, "ntp", socket.AF_UNSPEC, socket.SOCK_DGRAM)[0][4][0]
+            response = ntp_client.request(ntp_address, version=4, timeout=NTP_TIMEOUT)
+            # A slow round trip makes tx_time stale by up to the delay, don't trust it
+            if response.delay > NTP_MAX_DELAY:
+                raise ntplib.NTPException(f"Round trip delay too high: {response.delay:.3f}s")
+            ntp_offset = response.tx_time - time.monotonic()
+            ntp_synced_at = time.monotonic()
+        except Exception as e:
+            ntp_address = None  # The pool may have rotated that server out, resolve the name again next time
+            if ntp_offset is None:
+                logger.warning("NTP Error, syncing with system time: %s", e)
+                # Fallback to system time
+                return time.time() + TIME_ZONE_OFFSET_SECONDS
+            logger.warning("NTP Error, syncing with last NTP time: %s", e)
+    # Adjusting with local offset AFTER getting UTC timestamp
+    return time.monotonic() + ntp_offset + TIME_ZONE_OFFSET_SECONDS
 
 
 def sync_time():
@@ -68,7 +178,7 @@ def sync_time():
     logger.info("Starting periodic time sync.")
     while True:
         sync_time_internal()  # Attempt sync
-        time.sleep(3600)  # Sync periodically (e.g., every hour)
+        socketio.sleep(3600)  # Sync periodically (e.g., every hour)
 
 
 def sync_time_internal() -> bool:
@@ -78,25 +188,25 @@ def sync_time_internal() -> bool:
     """
     try:
         current_time = int(get_ntp_time())
-        command = f"{CMD_TIME}{current_time}\n"
-        send_arduino_command(command)
+        send_arduino_command_bytes(b"%s%d\n" % (CMD_TIME_B, current_time))
         return True  # Indicate success
     except ntplib.NTPException as e:
-        logger.warning(f"NTP Error, syncing with system time: {e}")
+        logger.warning("NTP Error, syncing with system time: %s", e)
         return False
     except Exception as e:
-        logger.error(f"Initial Time sync failed: {e}")
+        logger.error("Initial Time sync failed: %s", e)
         return False
 
 
 def request_initial_thresholds():
     """
     Requests the initial moisture and light thresholds from the Arduino.
+    Both are queued at once, serial_writer paces them to what the Arduino can take.
     """
     logger.info("Requesting initial moisture threshold...")
-    send_arduino_command("%s\n" % CMD_GET_MOISTURE_THRESH)
+    send_arduino_command_bytes(CMD_GET_MOISTURE_THRESH_B)
     logger.info("Requesting initial light threshold...")
-    send_arduino_command("%s\n" % CMD_GET_LIGHT_THRESH)
+    send_arduino_command_bytes(CMD_GET_LIGHT_THRESH_B)
 
 
 def serial_reader():
@@ -105,170 +215,371 @@ def serial_reader():
     Handles log reading, sensor data, and command responses.
     Emits relevant events to connected SocketIO clients.
     """
-    global MOISTURE_THRESH, LIGHT_THRESH
-    reading_logs = False
-    current_logs = []
+    current_logs, reading_logs = reset_logs()
+    # Local aliases for the functions called on every line (local lookups are cheaper than global ones)
+    _read_serial_lines, _read_logs, _handle_command = read_serial_lines, read_logs, handle_command
 
     while True:
         if reading_logs and (not ser or not ser.is_open):
             logger.warning("Serial port closed or error while reading logs. Sending partial logs.")
             socketio.emit('info', {"message": "Serial port closed or error while reading logs."})
-            if current_logs:
-                socketio.emit("log_data", {"logs": current_logs})
+            emit_log_chunk(current_logs, True)
             current_logs, reading_logs = reset_logs()
-            time.sleep(1)
+            socketio.sleep(1)
+            continue
+
+        if not ser:
+            socketio.sleep(1)
             continue
 
-        line = None
         try:
-            if ser and ser.in_waiting > 0:
-                line = ser.readline().decode(errors="ignore").strip()
+            lines = _read_serial_lines()
         except serial.SerialException as e:
-            logger.error(f"Serial Exception during read: {e}")
+            logger.error("Serial Exception during read: %s", e)
             if reading_logs:
                 socketio.emit("error", {"message": f"Serial error during log read: {e}"})
                 current_logs, reading_logs = reset_logs()
-            time.sleep(1)
+            socketio.sleep(1)
             continue
-        except UnicodeDecodeError:
-            logger.error("Serial read warning: UnicodeDecodeError")
-            socketio.emit("error", {"message": "UnicodeDecodeError in serial read"})
-            line = None
         except Exception as e:
-            logger.error(f"Unexpected error in serial_reader loop: {e}")
+            logger.error("Unexpected error in serial_reader loop: %s", e)
             if reading_logs:
                 socketio.emit("error", {"message": f"Unexpected error: {e}"})
                 current_logs, reading_logs = reset_logs()
-            time.sleep(1)
-            continue
-
-        if line is None:
-            time.sleep(0.1)  # Prevent busy-waiting
+            socketio.sleep(1)
             continue
 
-        if reading_logs:
-            current_logs, reading_logs = read_logs(current_logs, line, reading_logs)
-        else:
-            current_logs, reading_logs = handle_command(current_logs, line, reading_logs)
+        for line in lines:
+            try:
+                if reading_logs:
+                    current_logs, reading_logs = _read_logs(current_logs, line, reading_logs)
+                else:
+                    current_logs, reading_logs = _handle_command(current_logs, line, reading_logs)
+            except Exception as e:
+                # One bad line mustn't stop the reader, only the log dump it belongs to is dropped
+                logger.error("Error handling serial line %r: %s", line, e)
+                if reading_logs:
+                    socketio.emit("error", {"message": f"Error while reading logs: {e}"})
+                current_logs, reading_logs = reset_logs()
 
 
-def handle_command(current_logs: list, line: str, reading_logs: bool) -> tuple[list, bool]:
+def read_serial_lines() -> list[bytes]:
+    """
+    Blocks up to SERIAL_TIMEOUT until data arrives, then drains every byte waiting on the
+    serial port and splits the complete messages out of the receive buffer. Messages are
+    text lines or, for log dumps, a binary log frame. A trailing partial message is kept
+    until the rest of it arrives, without searching its bytes for a newline again.
+    Messages are sliced at a moving offset and the consumed bytes are dropped at once.
+    :return: Complete lines without their line ending and whole log frames as LogFrame, still encoded, empty if the read timed out.
+    """
+    global _rx_scanned
+    data = read_serial_data()
+    if not data:
+        return []
+    _rx_buf.extend(data)
+
+    lines = []
+    find, append = _rx_buf.find, lines.append
+    start, end = 0, len(_rx_buf)
+    scan = _rx_scanned
+    with memoryview(_rx_buf) as view:  # Slicing the view copies each message once, into its bytes object
+        while start < end:
+            frame_size = log_frame_size(_rx_buf, start)
+            if frame_size is not None:
+                if end - start < frame_size:
+                    break  # Wait for the rest of the frame
+                append(LogFrame(view[start:start + frame_size]))
+                start += frame_size
+                scan = start
+                continue
+            idx = find(b"\n", scan)
+            if idx < 0:
+                scan = end
+                break
+            stop = idx - 1 if idx > start and _rx_buf[idx - 1] == 13 else idx  # Leave out the \r of a \r\n ending
+            append(bytes(view[start:stop]))
+            start = scan = idx + 1
+    del _rx_buf[:start]  # The view is released, the buffer can be resized again
+    _rx_scanned = scan - start
+    return lines
+
+
+def read_serial_data() -> bytes:
+    """
+    Waits up to SERIAL_TIMEOUT for data, then reads every byte waiting on the serial port.
+    POSIX ports are waited on through their file descriptor in eventlet's hub, so the greenlet
+    yields without tying up a thread. Ports without a descriptor (Windows, pyserial URL handlers)
+    block in eventlet's native thread pool instead, so they don't stall the hub either.
+    :return: Received bytes, empty if the wait timed out.
+    """
+    fd = getattr(ser, "fd", None)
+    if fd is not None:
+        try:
+            trampoline(fd, read=True, timeout=SERIAL_TIMEOUT, timeout_exc=TimeoutError)
+        except TimeoutError:
+            return b""
+        return ser.read(ser.in_waiting or 1)  # Data is ready, this read doesn't block
+    chunk = tpool.execute(ser.read, 1)
+    waiting = ser.in_waiting
+    if chunk and waiting:
+        chunk += tpool.execute(ser.read, waiting)
+    return chunk
+
+
+def handle_command(current_logs: tuple, line: bytes, reading_logs: bool) -> tuple[tuple, bool]:
     """
     Processes a single line of serial input when not reading logs.
     Handles threshold updates, sensor data, and error messages.
-    :param current_logs: Current log entries.
+    Parameterized lines are dispatched on their first character through LINE_HANDLERS.
+    :param current_logs: Current log columns.
     :param line: Serial input line.
     :param reading_logs: Whether currently reading logs.
     :return: (current_logs, reading_logs)
     """
-    global MOISTURE_THRESH, LIGHT_THRESH
-
-    # Check for threshold responses
-    moisture_th_pattern = re.compile(rf"^{CMD_GET_MOISTURE_THRESH}(\d+)$")
-    light_th_pattern = re.compile(rf"^{CMD_GET_LIGHT_THRESH}(\d+)$")
-    sensor_data_pattern = re.compile(rf"^{MEASUREMENT_MOISTURE}(\d+){MEASUREMENT_LIGHT}(\d+)$")
-
-    mt_match = moisture_th_pattern.match(line)
-    lt_match = light_th_pattern.match(line)
-    sensor_match = sensor_data_pattern.match(line)
-    if line == SUCCESS:
+    if line.__class__ is LogFrame:
+        return read_log_frame(line)
+    handler = LINE_HANDLERS.get(line[:1])
+    if handler:
+        handler(line)
+    elif line == SUCCESS_B:
+        command_answered()
         logger.info("Command executed successfully.")
         socketio.emit("info", {"message": "Command executed successfully."})
-    elif mt_match:
-        try:
-            MOISTURE_THRESH = int(mt_match.group(1))
-            logger.info(f"Received moisture threshold: {MOISTURE_THRESH}")
-            socketio.emit("threshold_update", {
-                "key": KEY_MOISTURE_THRESH,
-                "value": MOISTURE_THRESH
-            })
-        except ValueError:
-            logger.error(f"Could not parse moisture threshold value from: {line}")
-            socketio.emit("error", {"message": f"Could not parse moisture threshold value from: {line}"})
-    elif lt_match:
-        try:
-            LIGHT_THRESH = int(lt_match.group(1))
-            logger.info(f"Received light threshold: {LIGHT_THRESH}")
-            socketio.emit("threshold_update", {
-                "key": KET_LIGHT_THRESH,
-                "value": LIGHT_THRESH
-            })
-        except ValueError:
-            logger.error(f"Could not parse light threshold value from: {line}")
-            socketio.emit("error", {"message": f"Could not parse light threshold value from: {line}"})
-    elif line == LOG_HEADER:
-        logger.info(f"Detected log header, starting log capture.")
+    elif line == LOG_HEADER_B:
+        logger.info("Detected log header, starting log capture.")
         reading_logs = True
-        current_logs = []
-    elif sensor_match:  # Sensor data m{moisture}l{light}
-        data = {}
-        l_part = line.find(MEASUREMENT_LIGHT)
-        if l_part != -1:
-            moisture_str = line[1:l_part]
-            light_str = line[l_part + 1:]
-            try:
-                data[CMD_SET_MOISTURE_THRESH] = int(moisture_str)
-                data[CMD_SET_LIGHT_THRESH] = int(light_str)
-                socketio.emit("sensor_update", {
-                    "moisture": data.get(CMD_SET_MOISTURE_THRESH, 0),
-                    "light": data.get(CMD_SET_LIGHT_THRESH, 0)
-                })
-            except ValueError:
-                logger.error(f"Could not parse moisture value from: {line}")
-                socketio.emit("error", {"message": f"Could not parse sensor values: {line}"})
-        else:
-            logger.error(f"Could not parse sensor value from: {line}")
-            socketio.emit("error", {"message": f"Malformed sensor data: {line}"})
-    elif line.startswith(CMD_UNK):
-        logger.error(f"Sent command not recognized by Arduino: {line[1:]}")
-        socketio.emit("error", {"message": f"Sent command not recognized by Arduino: {line[1:]}"})
-    elif line.startswith(ERROR):
-        logger.error(f"Arduino reported an error: {line[1:]}")
-        socketio.emit("error", {"message": f"Arduino error: {line[1:]}"})
+        current_logs = new_log_columns()
     else:
-        if line:  # Avoid printing empty lines if any
-            logger.debug(f"Received serial data: {line}")
-            socketio.emit("error", {"message": f"Unexpected data from Arduino: {line}"})
+        handle_unexpected_line(line)
     return current_logs, reading_logs
 
 
-def read_logs(current_logs: list, line: str, reading_logs: bool) -> tuple[list, bool]:
+def handle_moisture_threshold(line: bytes):
+    """
+    Handles a moisture threshold response X{threshold}.
+    :param line: Serial input line.
+    """
+    command_answered()
+    value = parse_threshold_line(line)
+    if value is None:
+        handle_unexpected_line(line)
+        return
+    state.moisture_thresh = value
+    logger.info("Received moisture threshold: %s", state.moisture_thresh)
+    socketio.emit("threshold_update", {
+        "key": KEY_MOISTURE_THRESH,
+        "value": state.moisture_thresh
+    })
+
+
+def handle_light_threshold(line: bytes):
+    """
+    Handles a light threshold response Z{threshold}.
+    :param line: Serial input line.
+    """
+    command_answered()
+    value = parse_threshold_line(line)
+    if value is None:
+        handle_unexpected_line(line)
+        return
+    state.light_thresh = value
+    logger.info("Received light threshold: %s", state.light_thresh)
+    socketio.emit("threshold_update", {
+        "key": KET_LIGHT_THRESH,
+        "value": state.light_thresh
+    })
+
+
+def handle_sensor_data(line: bytes):
+    """
+    Handles sensor data m{moisture}l{light}. The reading is broadcast later by sensor_emitter,
+    only if one of the values moved at least SENSOR_DEADBAND from the last stored reading.
+    :param line: Serial input line.
+    """
+    reading = parse_sensor_line(line)
+    if reading is None:
+        logger.error("Could not parse sensor values from: %s", line.decode(errors='ignore'))
+        socketio.emit("error", {"message": f"Malformed sensor data: {line.decode(errors='ignore')}"})
+        return
+    moisture, light = reading
+    with sensor_lock:
+        last_moisture = latest_sensor["moisture"]
+        if (last_moisture is not None and abs(moisture - last_moisture) < SENSOR_DEADBAND
+                and abs(light - latest_sensor["light"]) < SENSOR_DEADBAND):
+            return  # ADC noise around the last reading, not worth a broadcast
+        latest_sensor["moisture"] = moisture
+        latest_sensor["light"] = light
+        latest_sensor["dirty"] = True
+
+
+def handle_unknown_command(line: bytes):
+    """
+    Handles the Arduino's U{command} response to a command it didn't recognize.
+    :param line: Serial input line.
+    """
+    command_answered()
+    command = line[1:].decode(errors="ignore")
+    logger.error("Sent command not recognized by Arduino: %s", command)
+    socketio.emit("error", {"message": f"Sent command not recognized by Arduino: {command}"})
+
+
+def handle_arduino_error(line: bytes):
+    """
+    Handles an R{message} error reported by the Arduino.
+    :param line: Serial input line.
+    """
+    command_answered()
+    message = line[1:].decode(errors="ignore")
+    logger.error("Arduino reported an error: %s", message)
+    socketio.emit("error", {"message": f"Arduino error: {message}"})
+
+
+def handle_unexpected_line(line: bytes):
+    """
+    Reports a line that doesn't match any known message.
+    :param line: Serial input line.
+    """
+    if line:  # Avoid printing empty lines if any
+        text = line.decode(errors="ignore")
+        logger.debug("Received serial data: %r", line)
+        socketio.emit("error", {"message": f"Unexpected data from Arduino: {text}"})
+
+
+# Handlers for the lines identified by their first character
+LINE_HANDLERS = {
+    CMD_GET_MOISTURE_THRESH.encode(): handle_moisture_threshold,
+    CMD_GET_LIGHT_THRESH.encode(): handle_light_threshold,
+    MEASUREMENT_MOISTURE_B: handle_sensor_data,
+    CMD_UNK_B: handle_unknown_command,
+    ERROR_B: handle_arduino_error,
+}
+
+
+def threshold_flusher():
+    """
+    Sends the requested threshold values to the Arduino every THRESHOLD_FLUSH_INTERVAL seconds
+    and broadcasts them to the clients.
+    Updates received in between for the same key are coalesced, only the newest one is sent.
+    The commands go out back to back, serial_writer paces them to what the Arduino can take.
+    Runs as a SocketIO background task.
+    """
+    while True:
+        socketio.sleep(THRESHOLD_FLUSH_INTERVAL)
+        if not pending_thresholds:
+            continue
+        updates = list(pending_thresholds.items())
+        pending_thresholds.clear()
+        for key, val_int in updates:
+            command_prefix = CMD_SET_MOISTURE_THRESH if key == KEY_MOISTURE_THRESH else CMD_SET_LIGHT_THRESH
+            if not send_arduino_command_bytes(b"%c%d\n" % (ord(command_prefix), val_int)):
+                continue
+            # Update server-side stored threshold
+            if key == KEY_MOISTURE_THRESH:
+                state.moisture_thresh = val_int
+            else:  # key == KET_LIGHT_THRESH
+                state.light_thresh = val_int
+
+            logger.info("Broadcasting synced threshold: %s = %s", key, val_int)
+            socketio.emit("threshold_update", {"key": key, "value": val_int})
+
+
+def sensor_emitter():
+    """
+    Broadcasts the latest sensor reading to the clients every SENSOR_EMIT_INTERVAL seconds.
+    Readings received in between are coalesced, only the newest one is sent.
+    The same payload dict is refilled for every broadcast, emit encodes it before returning.
+    Runs as a SocketIO background task.
+    """
+    payload = {"moisture": 0, "light": 0}
+    while True:
+        socketio.sleep(SENSOR_EMIT_INTERVAL)
+        with sensor_lock:
+            if not latest_sensor["dirty"]:
+                continue
+            payload["moisture"] = latest_sensor["moisture"]
+            payload["light"] = latest_sensor["light"]
+            latest_sensor["dirty"] = False
+        socketio.emit("sensor_update", payload)
+
+
+def emit_log_chunk(columns: tuple, done: bool):
+    """
+    Sends log entries to the clients as parallel ts, type and value lists.
+    :param columns: (timestamps, event types, values) columns.
+    :param done: Whether this is the last chunk of the dump.
+    """
+    global log_entries_sent
+    timestamps, event_types, values = columns
+    socketio.emit("log_data_chunk", {
+        "ts": timestamps.tolist(),
+        "type": event_types.tolist(),
+        "value": values.tolist(),
+        "done": done
+    })
+    log_entries_sent += len(timestamps)
+    if done:
+        logger.debug("Sent %d log entries.", log_entries_sent)
+        log_entries_sent = 0
+
+
+def read_log_frame(frame: bytes) -> tuple[tuple, bool]:
+    """
+    Unpacks the records of a binary log frame.
+    Emits full chunks of LOG_CHUNK_SIZE entries, the rest is sent when the end marker arrives.
+    :param frame: Complete log frame, header included.
+    :return: (current_logs, reading_logs), the log columns not emitted yet while waiting for the end marker.
+    """
+    columns = parse_log_frame(frame)
+    if columns is None:
+        logger.error("Discarding malformed binary log frame of %d bytes.", len(frame))
+        socketio.emit("error", {"message": "Received a malformed log frame."})
+        return reset_logs()
+    logger.info("Detected binary log frame, waiting for end marker.")
+    count = len(columns[0])
+    full = count - count % LOG_CHUNK_SIZE
+    for start in range(0, full, LOG_CHUNK_SIZE):
+        emit_log_chunk(tuple(column[start:start + LOG_CHUNK_SIZE] for column in columns), False)
+    return tuple(column[full:] for column in columns), True
+
+
+def read_logs(current_logs: tuple, line: bytes, reading_logs: bool) -> tuple[tuple, bool]:
     """
     Processes a single line of serial input while reading logs.
-    Collects log entries and emits them when finished.
+    Collects log entries and emits them in chunks of LOG_CHUNK_SIZE entries,
+    the last chunk is flagged as done when the end marker arrives.
     Args:
-    :param current_logs: Current log entries.
+    :param current_logs: Current log columns.
     :param line: Serial input line.
     :param reading_logs: Whether currently reading logs.
     :return: (current_logs, reading_logs)
     """
-    log_pattern = re.compile(r"^(\d+),(\d+),(\d+)$")
-
-    if line == LOG_END:
+    if line == LOG_END_B:
+        command_answered()  # The whole log dump answers the get logs command
         logger.info("Detected E (End logs) marker.")
-        socketio.emit("log_data", {"logs": current_logs})
-        logger.debug(f"Current logs: {current_logs}")
+        emit_log_chunk(current_logs, True)
         current_logs, reading_logs = reset_logs()
     else:
-        match = log_pattern.match(line)
-        if match:
-            timestamp, event_type, value = match.groups()
-            current_logs.append({
-                "timestamp": int(timestamp),
-                "type": int(event_type),
-                "value": int(value)
-            })
+        entry = parse_log_line(line)
+        if entry is not None:
+            timestamps, event_types, values = current_logs
+            timestamp, event_type, value = entry
+            timestamps.append(timestamp)
+            event_types.append(event_type)
+            values.append(value)
+            if len(timestamps) >= LOG_CHUNK_SIZE:
+                emit_log_chunk(current_logs, False)
+                current_logs = new_log_columns()
         else:
-            logger.warning(f"Received unexpected line while reading logs: '{line}'")
+            logger.warning("Received unexpected line while reading logs: '%s'", line.decode(errors='ignore'))
     return current_logs, reading_logs
 
 
 def reset_logs() -> tuple:
     """
     Resets the log reading state.
-    :return: (empty list, False)
+    :return: (empty log columns, False)
     """
-    return [], False
+    return new_log_columns(), False
 
 
 @app.route('/')
@@ -283,38 +594,23 @@ def index():
 def threshold_update(data: object):
     """
     Handles threshold update requests from clients.
-    Validates and sends new threshold values to the Arduino.
+    Validates new threshold values and leaves them for threshold_flusher to send to the Arduino.
     """
-    global MOISTURE_THRESH, LIGHT_THRESH
     key = data.get("key")
     value = data.get("value")
-    logger.info(f"Received new threshold value: {value}")
+    logger.info("Received new threshold value: %s", value)
     if key not in [KEY_MOISTURE_THRESH, KET_LIGHT_THRESH]:
-        logger.error(f"Invalid key for threshold update: {key}")
+        logger.error("Invalid key for threshold update: %s", key)
         socketio.emit("error", {"message": f"Invalid threshold key: {key}"})
         return
 
     try:
-        val_int = max(min(int(value), 1023), 0)
-        command_prefix = CMD_SET_MOISTURE_THRESH if key == KEY_MOISTURE_THRESH else CMD_SET_LIGHT_THRESH
-        command = f"{command_prefix}{val_int}\n"
-        success_arduino = send_arduino_command(command)
-
-        if success_arduino:
-            # Update server-side stored threshold
-            if key == KEY_MOISTURE_THRESH:
-                MOISTURE_THRESH = val_int
-            else:  # key == KET_LIGHT_THRESH
-                LIGHT_THRESH = val_int
-
-            logger.info(f"Broadcasting synced threshold: {key} = {val_int}")
-            socketio.emit("threshold_update", {"key": key, "value": val_int})
-
+        pending_thresholds[key] = max(min(int(value), 1023), 0)  # Replaces a value not sent yet
     except ValueError:
-        logger.error(f"Could not parse threshold value from: {value}")
+        logger.error("Could not parse threshold value from: %s", value)
         socketio.emit("error", {"message": f"Invalid threshold value: {value}"}, room=request.sid)
     except Exception as e:  # Catch any other unexpected errors
-        logger.error(f"Unexpected error during threshold update: {e}")
+        logger.error("Unexpected error during threshold update: %s", e)
         socketio.emit("error", {"message": f"Unexpected error during threshold update: {e}"}, room=request.sid)
 
 
@@ -325,8 +621,7 @@ def handle_log_request():
     Sends a command to the Arduino to retrieve logs.
     """
     logger.info("Received log request from client.")
-    command = "%s\n" % CMD_GET_LOGS
-    if send_arduino_command(command):
+    if send_arduino_command_bytes(CMD_GET_LOGS_B):
         socketio.emit("log_request_sent", {"message": "Log request sent to Arduino."})
 
 
@@ -336,77 +631,127 @@ def handle_clear_logs_request():
     Handles requests from the frontend to clear logs on the Arduino.
     """
     logger.info("Received clear log request from client.")
-    command = "%s\n" % CMD_CLEAR_LOGS
-    send_arduino_command(command)
+    send_arduino_command_bytes(CMD_CLEAR_LOGS_B)
 
 
 @socketio.on("connect")
 def handle_connect():
     """
     Handles new client connections.
-    Sends current threshold values to the connected client.
+    Sends current threshold values to the connected client, both in a single message,
+    followed by the latest sensor reading.
     """
-    logger.info(f"Client connected with SID: {request.sid}")
-    if MOISTURE_THRESH is not None:  # Check if it has a value
-        socketio.emit("threshold_update", {
-            "key": KEY_MOISTURE_THRESH,
-            "value": MOISTURE_THRESH
-        }, room=request.sid)
-    if LIGHT_THRESH is not None:  # Check if it has a value
-        socketio.emit("threshold_update", {
-            "key": KET_LIGHT_THRESH,
-            "value": LIGHT_THRESH
-        }, room=request.sid)
+    logger.info("Client connected with SID: %s", request.sid)
+    thresholds = {KEY_MOISTURE_THRESH: state.moisture_thresh, KET_LIGHT_THRESH: state.light_thresh}
+    socketio.emit("thresholds_init", thresholds, room=request.sid)
+    with sensor_lock:
+        reading = {"moisture": latest_sensor["moisture"], "light": latest_sensor["light"]}
+    if reading["moisture"] is not None:  # Steady readings aren't broadcast again, send the current one
+        socketio.emit("sensor_update", reading, room=request.sid)
 
 
-def send_arduino_command(command_str: str):
+def send_arduino_command_bytes(command: bytes):
     """
-    Sends a command string to the Arduino over the serial port.
-    Ensures thread safety and proper command formatting.
-    :param command_str: (str) logger The command to send.
-    :return: True if the command was sent successfully, False otherwise.
+    Queues an already encoded, newline terminated command to be sent to the Arduino.
+    The write itself is done by serial_writer, so the caller doesn't wait for the serial port.
+    :param command: (bytes) The command to send.
+    :return: True if the command was queued, False if there is no serial port.
     """
     if not ser:
-        logger.error(f"Arduino not connected to a serial port. Cannot send command: {command_str}")
+        logger.error("Arduino not connected to a serial port. Cannot send command: %s", command.decode())
         socketio.emit("error", {"message": "Arduino not connected to a serial port."})
         return False
-    try:
-        full_command = command_str if command_str.endswith('\n') else f"{command_str}\n"
-        with lock:
-            ser.write(full_command.encode())
-        logger.info(f"Sent command to Arduino: {full_command}")
-        # socketio.emit("info", {"message": f"Command sent to Arduino: {full_command.strip()}"})
-        time.sleep(0.1)
-        return True
-    except Exception as e:
-        logger.error(f"Error sending command '{command_str}': {e}")
-        socketio.emit("error", {"message": f"Error sending command {command_str}: {e}"})
-        return False
+    tx_queue.put(command)
+    return True
 
 
-if __name__ == "__main__":
+def command_answered():
     """
-    Main entry point for the Flask web server.
-    Initializes serial communication, synchronizes time, and starts background threads.
+    Counts a reply from the Arduino to a command of the last batch written by serial_writer.
+    The Arduino replies after reading each command, so once every command is answered
+    the whole batch has left its RX buffer and the next one can be sent.
     """
-    if ser:
-        logger.info(f"Arduino connected to a serial port.")
-        time.sleep(2)  # Allow Arduino to settle
-        ser.reset_input_buffer()  # Clear any stale data from Arduino's buffer
-        logger.info("Attempting initial time sync...")
-        if not sync_time_internal():
-            logger.warning("Initial time sync failed. Arduino time may be incorrect until next sync.")
-            socketio.emit("error", {"message": "Initial time sync failed. Arduino time may be incorrect until next sync."})
-        else:
-            logger.info("Initial time sync command sent successfully.")
-            socketio.emit("info", {"message": "Initial time sync command sent successfully."})
+    global tx_unanswered
+    tx_unanswered -= 1
+    if tx_unanswered <= 0:
+        tx_answered.set()
 
-        request_initial_thresholds()
 
-        Thread(target=sync_time, daemon=True).start()
-        Thread(target=serial_reader, daemon=True).start()
-    else:
+def serial_writer():
+    """
+    Writes the queued commands to the Arduino, in order.
+    Commands queued meanwhile are joined into a single write of up to about SERIAL_TX_BATCH_SIZE bytes.
+    The firmware only reads its 64 B RX buffer every 1.5 s, so after each batch the writer waits for
+    the replies to all its commands, or SERIAL_DRAIN_INTERVAL at most, before sending the next one.
+    Being the only writer, it owns the serial port's output and needs no lock.
+    Runs as a SocketIO background task.
+    """
+    global tx_unanswered
+    while True:
+        batch = [tx_queue.get()]
+        size = len(batch[0])
+        while size < SERIAL_TX_BATCH_SIZE:
+            try:
+                command = tx_queue.get_nowait()
+            except Empty:
+                break
+            batch.append(command)
+            size += len(command)
+        commands = b"".join(batch)
+        tx_answered.clear()
+        tx_unanswered = len(batch)
+        try:
+            tpool.execute(ser.write, commands)
+            logger.debug("Sent commands to Arduino: %r", commands)
+        except Exception as e:
+            sent = commands.decode().strip().replace("\n", ", ")
+            logger.error("Error sending commands '%s': %s", sent, e)
+            socketio.emit("error", {"message": f"Error sending commands {sent}: {e}"})
+            continue
+        if not tx_answered.wait(SERIAL_DRAIN_INTERVAL):
+            # A reply got lost or a log dump is still coming, the firmware has read its buffer by now anyway
+            logger.debug("%d commands not answered in time, sending the next batch.", tx_unanswered)
+
+
+def start_arduino_link() -> bool:
+    """
+    Initializes serial communication, synchronizes time, and starts background threads.
+    Shared by the development server below and the production entry point in wsgi.py.
+    :return: True if the Arduino is connected, False otherwise.
+    """
+    if not ser:
         logger.error("Arduino not connected to a serial port.")
+        return False
+
+    logger.info("Arduino connected to a serial port.")
+    # The NTP lookup and query don't need the Arduino, run them while it settles
+    ntp_warmup = socketio.start_background_task(get_ntp_time)
+    time.sleep(2)  # Allow Arduino to settle
+    ser.reset_input_buffer()  # Clear any stale data from Arduino's buffer
+    socketio.start_background_task(serial_writer)
+    request_initial_thresholds()  # Queued first, serial_writer paces them and the time sync below
+    ntp_warmup.join()
+    logger.info("Attempting initial time sync...")
+    if not sync_time_internal():
+        logger.warning("Initial time sync failed. Arduino time may be incorrect until next sync.")
+        socketio.emit("error", {"message": "Initial time sync failed. Arduino time may be incorrect until next sync."})
+    else:
+        logger.info("Initial time sync command sent successfully.")
+        socketio.emit("info", {"message": "Initial time sync command sent successfully."})
+
+    socketio.start_background_task(sync_time)
+    socketio.start_background_task(serial_reader)
+    socketio.start_background_task(sensor_emitter)
+    socketio.start_background_task(threshold_flusher)
+    return True
+
+
+if __name__ == "__main__":
+    """
+    Main entry point for the Flask development web server.
+    For production, run wsgi.py under gunicorn instead.
+    """
+    if not start_arduino_link():
         sys.exit(1)
 
-    socketio.run(app, host="0.0.0.0", port=5000, allow_unsafe_werkzeug=True)
+    socketio.run(app, host="0.0.0.0", port=5000)
@@ -0,0 +1,13 @@
+"""
+Production entry point for the Flask web server.
+Only one process can own the Arduino's serial port, so run a single eventlet worker:
+
+    gunicorn -k eventlet -w 1 -b 0.0.0.0:5000 wsgi:app
+
+Behind a reverse proxy (e.g. nginx), forward the /socket.io/ location with the WebSocket upgrade headers.
+"""
+
+from web_server import app, start_arduino_link
+
+if not start_arduino_link():
+    raise RuntimeError("Arduino not connected to a serial port.")